@@ -36,7 +36,12 @@ setup(
         "Programming Language :: Python :: 3.13",
     ],
     description="A commandline tool to create and manage tasks and todos.",
-    entry_points={"console_scripts": ["tasks3=tasks3.cli:main",],},
+    entry_points={
+        "console_scripts": [
+            "tasks3=tasks3.cli:main",
+            "tasks3-chpwd=tasks3._chpwd:main",
+        ],
+    },
     install_requires=requirements,
     license="GNU General Public License v3",
     long_description=readme + "\n\n" + history,
@@ -4,4 +4,18 @@ __author__ = """Harsh Parekh"""
 __email__ = "harsh_parekh@outlook.com"
 __version__ = "0.9.1"
 
-from tasks3.tasks3 import add, edit, toggle_status, remove, search  # noqa: F401
+_API = ("add", "edit", "get", "toggle_status", "remove", "search")
+
+
+def __getattr__(name: str):
+    """Lazily resolve the package API.
+
+    Importing tasks3.tasks3 eagerly drags in SQLAlchemy, which dominates
+    interpreter startup for short CLI invocations; defer it until an API
+    function is first used.
+    """
+    if name in _API:
+        from tasks3 import tasks3
+
+        return getattr(tasks3, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,63 @@
+"""Fast path for the shell integration.
+
+``tasks3-chpwd`` prints the pending tasks anchored to the current
+directory like ``tasks3 show -o oneline`` does, but it runs on every
+directory change, so it talks to the database over a raw sqlite3
+connection instead of booting Click and SQLAlchemy.
+"""
+
+import os
+import sqlite3
+import sys
+
+from tasks3.config import config, DBBackend
+
+BOLD = "\033[1m"
+UNDERLINE = "\033[4m"
+END = "\033[0m"
+
+_QUERY = (
+    "SELECT id, title, folder FROM task "
+    "WHERE done = 0 AND folder LIKE ? "
+    "ORDER BY priority DESC"
+)
+
+
+def _one_line(id: str, title: str, folder: str, cwd: str) -> str:
+    """Mirror Task.one_line for a pending task row"""
+    rep = f"[{id}] {BOLD}{title}{END}"
+    try:
+        relative_folder = os.path.relpath(folder, cwd)
+    except ValueError:  # pragma: no cover - different drive on Windows
+        relative_folder = folder
+    if relative_folder != ".":
+        rep += f" [path: {UNDERLINE}{relative_folder}{END}]"
+    return rep
+
+
+def main() -> int:
+    """Print pending tasks anchored under the current directory"""
+    if config.db_backend != DBBackend.sqlite:
+        # Only sqlite has a raw fast path; fall back to the full CLI.
+        from tasks3.cli import main as cli_main
+
+        return cli_main(["show", "-o", "oneline"])
+    if not config.db_path.exists():
+        return 0
+    cwd = os.getcwd()
+    connection = sqlite3.connect(config.db_path)
+    try:
+        rows = connection.execute(_QUERY, (f"{cwd}%",)).fetchall()
+    except sqlite3.OperationalError:
+        # Database exists but was never initialized; nothing to show.
+        return 0
+    finally:
+        connection.close()
+    if rows:
+        lines = (_one_line(id, title, folder, cwd) for id, title, folder in rows)
+        sys.stdout.write("\n".join(lines) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
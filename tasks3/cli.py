@@ -1,18 +1,51 @@
 """Console script for tasks3."""
 
+import functools
 import sys
 
 import tasks3
-import tasks3.db
 
 import click
-import sqlalchemy
 
 from pathlib import Path
-from typing import Callable, Optional, Iterable, List
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Iterable, List
 
 from tasks3.config import config, OutputFormat
-from tasks3.db import Task
+
+if TYPE_CHECKING:
+    from tasks3.db import Task
+
+
+@functools.lru_cache(maxsize=32)
+def _resolved(path: Path) -> str:
+    """Resolve path to an absolute string, caching per process.
+
+    Path.resolve stats every parent directory, which is slow on network
+    filesystems; repeated resolutions of the same path hit the cache.
+    """
+    return str(path.expanduser().resolve())
+
+
+class OutputFormatType(click.ParamType):
+    """Parameter type that converts directly to an OutputFormat member.
+
+    Unlike click.Choice over the enum values, conversion happens once at
+    option-parse time and hands the command an OutputFormat, so command
+    bodies don't re-wrap the string themselves.
+    """
+
+    name = "format"
+    choices = tuple(fmt.value for fmt in OutputFormat)
+
+    def convert(self, value, param, ctx) -> OutputFormat:
+        if isinstance(value, OutputFormat):
+            return value
+        try:
+            return OutputFormat(value)
+        except ValueError:
+            self.fail(
+                f"{value!r} is not one of {', '.join(self.choices)}.", param, ctx
+            )
 
 
 @click.group()
@@ -30,7 +63,9 @@ def main(ctx: click.core.Context, db: Path):
 
     ctx.ensure_object(dict)
     config.db_path = db
-    engine = sqlalchemy.create_engine(config.db_uri)
+    import tasks3.db
+
+    engine = tasks3.db.get_engine(config.db_uri)
     tasks3.db.init(db_engine=engine)
     ctx.obj["config"] = config
     ctx.obj["engine"] = engine
@@ -74,7 +109,7 @@ def main(ctx: click.core.Context, db: Path):
 @click.option(
     "-o",
     "--output-format",
-    type=click.Choice([fmt.value for fmt in OutputFormat]),
+    type=OutputFormatType(),
     default=config.search_output_format,
     show_default=True,
     help="Output format.",
@@ -90,7 +125,7 @@ def search(
     tags: Optional[List[str]],
     folder: Optional[Path],
     description: Optional[str],
-    output_format: str,
+    output_format: OutputFormat,
 ):
     """Search for tasks"""
     engine = ctx.obj["engine"]
@@ -99,8 +134,8 @@ def search(
     if done is not None:
         done: bool = done == "yes"
     if folder:
-        folder = str(folder.expanduser().resolve())
-    results: List[Task] = tasks3.search(
+        folder = _resolved(folder)
+    results = tasks3.search(
         db_engine=engine,
         id=id,
         title=title,
@@ -111,38 +146,44 @@ def search(
         folder=folder,
         description=description,
     )
-    output_format = OutputFormat(output_format)
     fmt = __fmt(output_format)
-    for task in results:
-        click.echo(fmt(self=task))
+    if output_format == OutputFormat.json:
+        # Emit one valid JSON array rather than a JSON document per line,
+        # so consumers can parse the whole result set in one go.
+        click.echo("[" + ",".join(fmt(self=task) for task in results) + "]")
+        return
+    output = "\n".join(fmt(self=task) for task in results)
+    if output:
+        click.echo(output)
 
 
 @main.command()
 @click.option(
     "-o",
     "--output-format",
-    type=click.Choice([fmt.value for fmt in OutputFormat]),
+    type=OutputFormatType(),
     default=config.show_output_format,
     help="Output format.",
     show_default=True,
 )
 @click.argument("id", type=str, required=False)
 @click.pass_context
-def show(ctx: click.core.Context, output_format: str, id: str):
+def show(ctx: click.core.Context, output_format: OutputFormat, id: str):
     """Show the task in the specified FORMAT
 
     ID is the id of the Task to be printed;
     if not specified, all tasks in current directory are printed.
     """
     engine = ctx.obj["engine"]
-    fmt = __fmt(OutputFormat(output_format))
+    fmt = __fmt(output_format)
     if id is None:
         tasks = tasks3.search(db_engine=engine, done=False, folder=str(Path.cwd()))
     else:
-        tasks = tasks3.search(db_engine=engine, id=id)[:1]
-    for task in tasks:
-        click.echo(fmt(self=task))
-    pass
+        task = tasks3.get(db_engine=engine, id=id)
+        tasks = [] if task is None else [task]
+    output = "\n".join(fmt(self=task) for task in tasks)
+    if output:
+        click.echo(output)
 
 
 @main.command()
@@ -204,7 +245,7 @@ def edit(
     ID is the id of the Task to be edited.
     """
     engine = ctx.obj["engine"]
-    search_results = tasks3.search(db_engine=engine, id=id)
+    search_results = list(tasks3.search(db_engine=engine, id=id))
     if len(search_results) != 1:
         click.echo(f"Couldn't uniquely find Task with id={id}.", err=True)
         return 1
@@ -275,7 +316,7 @@ def remove(ctx: click.core.Context, yes: bool, id: str):
     """
     engine = ctx.obj["engine"]
     if not yes:
-        task = tasks3.search(db_engine=engine, id=id)
+        task = list(tasks3.search(db_engine=engine, id=id))
         if len(task) != 1:
             click.echo(f"Couldn't uniquely find Task with id={id}.", err=True)
             return 1
@@ -341,6 +382,8 @@ def add(
     yes: bool,
 ):
     """Add a new task"""
+    from tasks3.db import Task
+
     engine = ctx.obj["engine"]
     description = description.replace("\\n", "\n").replace("\\t", "\t")
     task = Task(
@@ -348,7 +391,7 @@ def add(
         urgency=urgency,
         importance=importance,
         tags=tags,
-        folder=str(folder.expanduser().resolve()),
+        folder=_resolved(folder),
         description=description,
     )
     if not yes:
@@ -362,9 +405,8 @@ def add(
 
 
 @main.command()
-@click.pass_context
 @click.argument("shell", type=click.Choice(["bash", "zsh", "fish"]))
-def shell(ctx: click.core.Context, shell: str):
+def shell(shell: str):
     """
     Integrate with your shell
 
@@ -374,35 +416,32 @@ def shell(ctx: click.core.Context, shell: str):
         Ex. eval "$(tasks3 shell zsh)"
     """
     if shell == "bash":
-        click.echo("function _chpwd_tasks3() { tasks3 show -o oneline; }")
+        click.echo("function _chpwd_tasks3() { tasks3-chpwd; }")
         click.echo('function cd () { builtin cd "$@"; _chpwd_tasks3; }')
     elif shell == "zsh":
-        click.echo("function _chpwd_tasks3() { tasks3 show -o oneline; }")
+        click.echo("function _chpwd_tasks3() { tasks3-chpwd; }")
         click.echo("chpwd_functions+=(_chpwd_tasks3)")
     elif shell == "fish":
-        click.echo("function _chpwd_tasks3; tasks3 show -o oneline; end")
+        click.echo("function _chpwd_tasks3; tasks3-chpwd; end")
         click.echo("function cd; builtin cd $argv; _chpwd_tasks3; end")
 
 
 @main.group()
-@click.pass_context
-def db(ctx: click.core.Context):
+def db():
     """Manage tasks3's database"""
     pass
 
 
 @db.command()
 @click.confirmation_option(prompt="Are you sure you want to purge all tasks?")
-@click.pass_context
-def purge(ctx: click.core.Context):
+def purge():
     """Purge all tasks from the database"""
     pass
 
 
 @db.command()
 @click.confirmation_option(prompt="Are you sure you want to drop the database?")
-@click.pass_context
-def drop(ctx: click.core.Context):
+def drop():
     """Drop the databse"""
     pass
 
@@ -414,8 +453,7 @@ def drop(ctx: click.core.Context):
     type=click.Path(dir_okay=False, writable=True, path_type=Path),
     default=config.db_path,
 )
-@click.pass_context
-def move(ctx: click.core.Context, dest_db: str):
+def move(dest_db: str):
     """Move tasks database to DEST_DB
 
     DEST_DB will be overwriten if it already exists.
@@ -423,25 +461,31 @@ def move(ctx: click.core.Context, dest_db: str):
     pass
 
 
-def __fmt(format: OutputFormat) -> Callable[[Task], str]:
+_FMT_TABLE: Dict[OutputFormat, Callable[["Task"], str]] = {}
+
+
+def __fmt(format: OutputFormat) -> Callable[["Task"], str]:
     """
     Return a function that formats a Task object according to the specified format.
 
+    The table is filled on first use so that importing this module does
+    not pull in the model (and with it SQLAlchemy).
+
     :param format: The format to use.
     """
-    if format == OutputFormat.oneline:
-        fmt = Task.one_line
-    elif format == OutputFormat.short:
-        fmt = Task.short
-    elif format == OutputFormat.yaml:
-
-        def _fmt(self):
-            return Task.yaml(self=self) + "\n"
-
-        fmt = _fmt
-    elif format == OutputFormat.json:
-        fmt = Task.json
-    return fmt
+    if not _FMT_TABLE:
+        from tasks3.db import Task
+
+        _FMT_TABLE.update(
+            {
+                OutputFormat.oneline: Task.one_line,
+                OutputFormat.short: Task.short,
+                OutputFormat.yaml: Task.yaml,
+                OutputFormat.json: Task.json,
+                OutputFormat.csv: Task.csv,
+            }
+        )
+    return _FMT_TABLE[format]
 
 
 if __name__ == "__main__":
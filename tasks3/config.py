@@ -30,6 +30,7 @@ class OutputFormat(Enum):
     short = "short"
     yaml = "yaml"
     json = "json"
+    csv = "csv"
 
 
 @dataclass
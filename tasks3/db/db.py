@@ -1,26 +1,97 @@
 """Database management functions"""
 
+import json
+
+from sqlalchemy import inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Query
 
 from tasks3 import db
 from tasks3.db.extension import session_scope
+from tasks3.db.models import task_tag
 
 
 def init(db_engine: Engine) -> None:
     """Initialize the database used by db_engine to store Tasks
 
+    Databases written by older releases are migrated to the current
+    schema first.
+
     :param db_engine: engine for the database
     """
+    _migrate_legacy_schema(db_engine)
     db.Task.metadata.create_all(bind=db_engine)
 
 
+def _migrate_legacy_schema(db_engine: Engine) -> None:
+    """Rebuild a task table written by a pre-tag-table release
+
+    Older releases stored urgency and importance as two integer columns
+    and tags as a JSON list per task. Detect such a table by its missing
+    priority column, rebuild it in the current layout, pack priority as
+    (urgency << 4) | importance, and backfill the tag and task_tag
+    tables from the JSON lists.
+
+    :param db_engine: engine for the database
+    """
+    inspector = inspect(db_engine)
+    if not inspector.has_table("task"):
+        return
+    columns = {column["name"] for column in inspector.get_columns("task")}
+    if "priority" in columns:
+        return
+    task = db.Task.__table__
+    tag = db.Tag.__table__
+    with db_engine.begin() as connection:
+        rows = (
+            connection.execute(
+                text(
+                    "SELECT id, title, done, urgency, importance, tags,"
+                    " folder, description FROM task"
+                )
+            )
+            .mappings()
+            .all()
+        )
+        connection.execute(text("ALTER TABLE task RENAME TO task_legacy"))
+        db.Task.metadata.create_all(bind=connection)
+        tag_ids = {}
+        for row in rows:
+            connection.execute(
+                task.insert().values(
+                    id=row["id"],
+                    title=row["title"],
+                    done=row["done"],
+                    priority=(row["urgency"] << 4) | row["importance"],
+                    folder=row["folder"],
+                    description=row["description"],
+                )
+            )
+            names = row["tags"]
+            if not isinstance(names, list):
+                names = json.loads(names or "[]")
+            for name in dict.fromkeys(names):
+                if name not in tag_ids:
+                    result = connection.execute(tag.insert().values(name=name))
+                    tag_ids[name] = result.inserted_primary_key[0]
+                connection.execute(
+                    task_tag.insert().values(
+                        task_id=row["id"], tag_id=tag_ids[name]
+                    )
+                )
+        connection.execute(text("DROP TABLE task_legacy"))
+
+
 def purge(db_engine: Engine) -> None:
-    """Remove all tasks from the database
+    """Remove all tasks, and their tags, from the database
 
     :param db_engine: engine for the database
     """
     with session_scope(bind=db_engine) as session:
+        # Clear the association rows first so the deletes also pass on
+        # backends that enforce foreign keys.
+        session.execute(task_tag.delete())
+        Query(db.Tag, session).delete()
         Query(db.Task, session).delete()
 
 
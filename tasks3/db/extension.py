@@ -1,13 +1,28 @@
 """Extensions to improve the experience of handling the database."""
 
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Generator
 
+from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm import Session
 
 
+@lru_cache(maxsize=4)
+def get_engine(db_uri: str) -> Engine:
+    """Return the Engine for db_uri, reusing it across calls.
+
+    Building an Engine sets up the dialect and connection pool from
+    scratch; caching it per URI lets every database operation in a
+    process share one engine and its pool.
+
+    :param db_uri: URI of the tasks database.
+    """
+    return create_engine(db_uri)
+
+
 @contextmanager
 def session_scope(bind: Engine, *args, **kwargs) -> Generator[Session, Engine, None]:
     """Provide a transactional scope around a series of database operations.
@@ -1,21 +1,36 @@
 """Task database model"""
 
-import json
+import csv as _csv
+import io
 import uuid
 
+import orjson
+
+import yaml as pyyaml
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+except ImportError:  # pragma: no cover - libyaml not available
+    from yaml import SafeDumper as YamlDumper
+
 from pathlib import Path
 from typing import Optional
 from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
-    Integer,
-    JSON,
+    ForeignKey,
+    Index,
+    SmallInteger,
+    Table,
     Unicode,
     UnicodeText,
     String,
 )
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship
 
 UUID_LENGTH = 6
 
@@ -40,6 +55,32 @@ class Base:
     )
 
 
+task_tag = Table(
+    "task_tag",
+    Base.metadata,
+    Column("task_id", ForeignKey("task.id"), primary_key=True, index=True),
+    Column("tag_id", ForeignKey("tag.id"), primary_key=True, index=True),
+)
+
+
+class Tag(Base):
+    """
+    Tag Model
+
+    A tag name, stored once and shared by every task carrying it, so tag
+    filters resolve through an index lookup instead of unpacking a
+    serialized list per row.
+
+    :param id: Unique ID for the tag.
+    :param name: Name of the tag.
+    """
+
+    name = Column(Unicode, unique=True, index=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Tag {self.name}>"
+
+
 class Task(Base):
     """
     Task Model
@@ -58,30 +99,74 @@ class Task(Base):
 
     title = Column(Unicode, nullable=False)
     done: bool = Column(Boolean, default=False, nullable=False)
-    urgency = Column(Integer, nullable=False)
-    importance = Column(Integer, nullable=False)
-    tags = Column(JSON, nullable=False)
+    #: urgency and importance each fit in 3 bits; pack them into one
+    #: small-integer column as (urgency << 4) | importance, which also
+    #: makes descending priority order equal descending (urgency,
+    #: importance) order.
+    priority = Column(SmallInteger, nullable=False)
+    _tags = relationship(
+        "Tag", secondary=task_tag, lazy="selectin", order_by="Tag.name"
+    )
+    tags = association_proxy("_tags", "name", creator=lambda name: Tag(name=name))
     folder = Column(Unicode, nullable=True)
     description = Column(UnicodeText, nullable=True)
 
     __table_args__ = (
-        CheckConstraint(0 <= urgency, "Urgency interval check"),
-        CheckConstraint(urgency <= 4, "Urgency interval check"),
-        CheckConstraint(0 <= importance, "Importance interval check"),
-        CheckConstraint(importance <= 4, "Importance interval check"),
+        CheckConstraint(0 <= priority, "Priority interval check"),
+        CheckConstraint(priority <= 0x44, "Priority interval check"),
+        CheckConstraint(priority.op("&")(0x0F) <= 4, "Importance interval check"),
+        Index("ix_task_folder", "folder"),
+        Index("ix_task_priority", "priority"),
     )
 
+    @hybrid_property
+    def urgency(self) -> Optional[int]:
+        """Urgency level[0-4] unpacked from the priority byte"""
+        if self.priority is None:
+            return None
+        return self.priority >> 4
+
+    @urgency.setter
+    def urgency(self, value: int) -> None:
+        self.priority = ((self.priority or 0) & 0x0F) | (value << 4)
+
+    @urgency.expression
+    def urgency(cls):
+        return cls.priority.op(">>")(4)
+
+    @hybrid_property
+    def importance(self) -> Optional[int]:
+        """Importance level[0-4] unpacked from the priority byte"""
+        if self.priority is None:
+            return None
+        return self.priority & 0x0F
+
+    @importance.setter
+    def importance(self, value: int) -> None:
+        self.priority = ((self.priority or 0) & ~0x0F) | value
+
+    @importance.expression
+    def importance(cls):
+        return cls.priority.op("&")(0x0F)
+
     def to_dict(self) -> dict:
-        return dict(
-            id=self.id,
-            title=self.title,
-            done=self.done,
-            urgency=self.urgency,
-            importance=self.importance,
-            tags=self.tags,
-            folder=self.folder,
-            description=self.description,
-        )
+        # Read column state straight from __dict__, skipping SQLAlchemy's
+        # instrumented descriptors and their lazy-load guards. Loaded and
+        # freshly constructed instances keep their state there; unset
+        # attributes come back as None, same as the descriptor would
+        # return outside a flush.
+        d = self.__dict__
+        priority = d.get("priority")
+        return {
+            "id": d.get("id"),
+            "title": d.get("title"),
+            "done": d.get("done"),
+            "urgency": None if priority is None else priority >> 4,
+            "importance": None if priority is None else priority & 0x0F,
+            "tags": list(self.tags),
+            "folder": d.get("folder"),
+            "description": d.get("description"),
+        }
 
     @property
     def relative_folder(self) -> Optional[str]:
@@ -124,25 +209,25 @@ class Task(Base):
 
     def yaml(self) -> str:
         """YAML representation of the task"""
-        top = (
-            f"title: {self.title}\n"
-            f"done: {self.done}\n"
-            f"urgency: {self.urgency}\n"
-            f"importance: {self.importance}"
+        return pyyaml.dump(
+            self.to_dict(),
+            Dumper=YamlDumper,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
         )
-        tags = "tags: null"
-        if len(self.tags) > 0:
-            tags = "tags:\n  - " + "\n  - ".join(self.tags)
-        folder = f"folder: {'null' if self.folder is None else self.folder}"
-        yaml = f"{top}\n{tags}\n{folder}\n"
-        if self.description is not None and len(self.description) > 0:
-            description = self.description.replace("\n", "\n  ")
-            yaml += f"description: >-\n  {description}\n"
-        return yaml
+
+    def csv(self) -> str:
+        """CSV representation of the task"""
+        buffer = io.StringIO()
+        _csv.writer(buffer).writerow(
+            (self.id, self.title, self.urgency, self.importance)
+        )
+        return buffer.getvalue().rstrip("\r\n")
 
     def json(self) -> str:
         """JSON representation of the task"""
-        return json.dumps(self.to_dict(), indent=2)
+        return orjson.dumps(self.to_dict()).decode()
 
     def __repr__(self) -> str:
         return f"<Task{self.to_dict().__repr__()}>"
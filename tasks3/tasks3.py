@@ -1,12 +1,50 @@
 """Main module."""
 
 from functools import singledispatch
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from tasks3.db import Task, session_scope
+from tasks3.db import Tag, Task, session_scope
 
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Query
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Session
+
+#: Prebuilt statement for the shell-integration hot path (pending tasks
+#: under the current directory); only the bound folder value changes
+#: between invocations, so the compiled form is reused as-is.
+_FOLDER_STMT = (
+    select(Task)
+    .where(Task.done.is_(False), Task.folder.like(bindparam("folder")))
+    .order_by(Task.priority.desc())
+    .execution_options(yield_per=1000)
+)
+
+
+def _merge_tags(session: Session, task: Task) -> None:
+    """Swap task's pending Tag rows for existing ones with the same name.
+
+    Tag names are unique; a task picking up an already-known tag must
+    point at the stored row instead of flushing a duplicate, and a name
+    repeated within the task itself must collapse to one Tag instance.
+
+    :param session: Session the task is (about to be) attached to.
+    :param task: Task whose tags should be deduplicated.
+    """
+    with session.no_autoflush:
+        resolved: dict = {}
+        for tag in list(task._tags):
+            if tag.name not in resolved:
+                existing = (
+                    session.query(Tag).filter_by(name=tag.name).one_or_none()
+                )
+                resolved[tag.name] = tag if existing is None else existing
+            if resolved[tag.name] is not tag and tag in session:
+                # The fresh Tag was already cascaded into the session when
+                # it joined the collection; drop it so it is not flushed
+                # alongside the row it duplicates.
+                session.expunge(tag)
+        task._tags[:] = list(resolved.values())
 
 
 def search(
@@ -19,10 +57,17 @@ def search(
     tags: Optional[List[str]] = None,
     folder: Optional[str] = None,
     description: Optional[str] = None,
-) -> List[Task]:
+) -> Iterator[Task]:
     """Search for tasks
 
-    :param id: Search for tasks that start with ``id``.
+    Tasks are streamed in batches rather than materialized as one list,
+    so peak memory stays bounded for large result sets and output can
+    begin before the last row is fetched. Tag collections are loaded
+    eagerly per batch, so the yielded tasks stay usable after the search
+    session is gone.
+
+    :param id: Search for tasks whose id starts with ``id``;
+        pass ``/partial-id/`` to match ``partial-id`` anywhere in the id.
     :param title: Search for tasks with this substring in title.
     :param done: Search for tasks that are done.
     :param urgency: Search for tasks with this urgency level.
@@ -31,27 +76,58 @@ def search(
     :param folder: Search for tasks under this folder.
     :param db_engine: Engine for the tasks database.
     """
-    with session_scope(db_engine) as session:
-        query: Query = Query(Task, session)
+    params = {}
+    if (
+        folder
+        and done is False
+        and not any((id, title, urgency, importance, tags, description))
+    ):
+        stmt = _FOLDER_STMT
+        params = {"folder": f"{folder}%"}
+    else:
+        stmt = select(Task)
         if urgency:
-            query = query.filter(Task.urgency == urgency)
+            stmt = stmt.where(Task.urgency == urgency)
         if importance:
-            query = query.filter(Task.importance == importance)
+            stmt = stmt.where(Task.importance == importance)
         if id:
-            query = query.filter(Task.id.contains(id))
+            if len(id) > 1 and id.startswith("/") and id.endswith("/"):
+                stmt = stmt.where(Task.id.contains(id[1:-1]))
+            else:
+                stmt = stmt.where(Task.id.startswith(id))
         if title:
-            query = query.filter(Task.title.contains(title))
+            stmt = stmt.where(Task.title.contains(title))
         if done is not None:
-            query = query.filter(Task.done == done)
+            stmt = stmt.where(Task.done == done)
         if folder:
-            query = query.filter(Task.folder.like(f"{folder}%"))
+            stmt = stmt.where(Task.folder.like(f"{folder}%"))
         if description:
-            query = query.filter(Task.description.contains(description))
-        results = query.order_by(Task.urgency, Task.importance).all()
-        results.reverse()
+            stmt = stmt.where(Task.description.contains(description))
         if tags:
-            results = [task for task in results if set(tags) <= set(task.tags)]
-        return results
+            stmt = (
+                stmt.join(Task._tags)
+                .where(Tag.name.in_(tags))
+                .group_by(Task.id)
+                .having(func.count(Tag.id) == len(set(tags)))
+            )
+        stmt = stmt.order_by(Task.priority.desc())
+        stmt = stmt.execution_options(yield_per=1000)
+    with session_scope(db_engine) as session:
+        for (task,) in session.execute(stmt, params):
+            yield task
+
+
+def get(id: str, db_engine: Engine) -> Optional[Task]:
+    """Fetch a Task by its id
+
+    Uses the session's primary-key fast path instead of building a
+    filtered query.
+
+    :param id: ID of the task to fetch.
+    :param db_engine: Engine for the tasks database.
+    """
+    with session_scope(db_engine) as session:
+        return session.get(Task, id)
 
 
 @singledispatch
@@ -99,8 +175,13 @@ def _(
     :param db_engine: Engine for the tasks database.
     """
     with session_scope(db_engine) as session:
+        _merge_tags(session, task)
         session.add(task)
         session.flush()
+        # Constructing a Task with no tags never materializes the tag
+        # collection; load it while the session is still open so the
+        # task stays usable after it detaches.
+        _ = task._tags
         return task.id
 
 
@@ -129,7 +210,9 @@ def edit(
     :param description: Description of the task.
     """
     with session_scope(db_engine) as session:
-        task: Task = Query(Task, session).filter_by(id=id).one()
+        task: Task = session.get(Task, id)
+        if task is None:
+            raise NoResultFound(f"No Task found with id={id}")
         if title:
             task.title = title
         if done is not None:
@@ -140,6 +223,7 @@ def edit(
             task.importance = importance
         if tags:
             task.tags = tags
+            _merge_tags(session, task)
         if folder:
             task.folder = folder
         if description:
@@ -164,7 +248,9 @@ def toggle_status(
     :param db_engine: Engine for the tasks database.
     """
     with session_scope(db_engine) as session:
-        task: Task = Query(Task, session).filter_by(id=id).one()
+        task: Task = session.get(Task, id)
+        if task is None:
+            raise NoResultFound(f"No Task found with id={id}")
         task.done = not task.done
         if dry_run:
             task = Task(**task.to_dict())
@@ -182,6 +268,8 @@ def remove(id: str, db_engine: Engine) -> Task:
     :param db_engine: Engine for the tasks database.
     """
     with session_scope(db_engine) as session:
-        task: Task = Query(Task, session).filter_by(id=id).one()
+        task: Task = session.get(Task, id)
+        if task is None:
+            raise NoResultFound(f"No Task found with id={id}")
         session.delete(task)
     return task
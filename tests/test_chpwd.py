@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+"""Tests for the tasks3-chpwd shell-integration fast path"""
+
+import sqlite3
+
+import pytest
+
+from pathlib import Path
+from click.testing import CliRunner
+
+from tasks3 import _chpwd, cli
+from tasks3.config import config
+
+
+@pytest.fixture
+def cli_runner():
+    return CliRunner()
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path.joinpath("task.db")
+    monkeypatch.setattr(config, "db", str(path))
+    return path
+
+
+def test_chpwd_matches_show_oneline(db_path: Path, cli_runner, capsys):
+    cwd = str(Path.cwd())
+    add_here = cli_runner.invoke(
+        cli.main,
+        ["--db", str(db_path), "add", "-T", "Here", "-u", "3", "--yes"],
+    )
+    assert add_here.exit_code == 0
+    add_below = cli_runner.invoke(
+        cli.main,
+        [
+            "--db",
+            str(db_path),
+            "add",
+            "-T",
+            "Below",
+            "-u",
+            "1",
+            "-f",
+            f"{cwd}/sub",
+            "--yes",
+        ],
+    )
+    assert add_below.exit_code == 0
+    # color=True keeps the ANSI styling that tasks3-chpwd emits verbatim.
+    show = cli_runner.invoke(
+        cli.main, ["--db", str(db_path), "show", "-o", "oneline"], color=True
+    )
+    assert show.exit_code == 0
+    assert _chpwd.main() == 0
+    assert capsys.readouterr().out == show.output
+
+
+def test_chpwd_skips_done_tasks(db_path: Path, cli_runner, capsys):
+    add = cli_runner.invoke(
+        cli.main, ["--db", str(db_path), "add", "-T", "Done already", "--yes"]
+    )
+    assert add.exit_code == 0
+    id = add.output.split("]")[0].split("[")[1]
+    mark = cli_runner.invoke(cli.main, ["--db", str(db_path), "mark", id])
+    assert mark.exit_code == 0
+    assert _chpwd.main() == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_chpwd_missing_db(db_path: Path, capsys):
+    assert not db_path.exists()
+    assert _chpwd.main() == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_chpwd_uninitialized_db(db_path: Path, capsys):
+    sqlite3.connect(db_path).close()
+    assert db_path.exists()
+    assert _chpwd.main() == 0
+    assert capsys.readouterr().out == ""
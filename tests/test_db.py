@@ -6,12 +6,14 @@ import pytest
 
 from typing import Tuple
 from pathlib import Path
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, Query
 
 from tasks3 import db
-from tasks3.db import Task, session_scope
+from tasks3.db import Tag, Task, session_scope
+from tasks3.db.models import task_tag
 
 
 @pytest.fixture(params=["sqlite"])
@@ -33,8 +35,10 @@ def test_db_init(tmp_path: Path, db_backend: str):
     db.init(db_engine)
     assert db_path.exists()
     table_names = inspect(db_engine).get_table_names()
-    assert len(table_names) == 1
+    assert len(table_names) == 3
     assert "task" in table_names
+    assert "tag" in table_names
+    assert "task_tag" in table_names
 
 
 def test_db_add_task(tmp_path: Path, db_backend: str):
@@ -78,3 +82,66 @@ def test_db_drop(tmp_path: Path, db_backend: str):
     table_names_after = inspect(db_engine).get_table_names()
     assert len(table_names_after) == 0
     assert "task" not in table_names_after
+
+
+def test_db_purge_clears_tags(tmp_path: Path, db_backend: str):
+    db_path, db_engine = get_db(tmp_path, db_backend)
+    db.init(db_engine)
+    task = Task(title="Title", urgency=2, importance=2, tags=["pytest", "db"])
+    session: Session
+    with session_scope(db_engine) as session:
+        session.add(task)
+    db.purge(db_engine)
+    with session_scope(db_engine) as session:
+        assert Query(Task, session).count() == 0
+        assert Query(Tag, session).count() == 0
+        assert session.execute(task_tag.select()).all() == []
+
+
+def test_db_priority_constraint(tmp_path: Path, db_backend: str):
+    db_path, db_engine = get_db(tmp_path, db_backend)
+    db.init(db_engine)
+    task = Task(title="Title", urgency=2, importance=2, tags=[])
+    task.priority = (5 << 4) | 5
+    session: Session
+    with pytest.raises(IntegrityError):
+        with session_scope(db_engine) as session:
+            session.add(task)
+            session.flush()
+
+
+def test_db_init_migrates_legacy_schema(tmp_path: Path, db_backend: str):
+    db_path, db_engine = get_db(tmp_path, db_backend)
+    with db_engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE task (title VARCHAR NOT NULL,"
+                " done BOOLEAN NOT NULL, urgency INTEGER NOT NULL,"
+                " importance INTEGER NOT NULL, tags JSON NOT NULL,"
+                " folder VARCHAR, description TEXT,"
+                " id VARCHAR(6) NOT NULL PRIMARY KEY)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO task VALUES ('Title', 0, 3, 1,"
+                " '[\"pytest\", \"legacy\", \"pytest\"]',"
+                " NULL, NULL, 'abc123')"
+            )
+        )
+    db.init(db_engine)
+    table_names = inspect(db_engine).get_table_names()
+    assert "tag" in table_names
+    assert "task_tag" in table_names
+    session: Session
+    with session_scope(db_engine) as session:
+        task: Task = session.get(Task, "abc123")
+        assert task.title == "Title"
+        assert task.done is False
+        assert task.urgency == 3
+        assert task.importance == 1
+        assert task.tags == ["legacy", "pytest"]
+    # A second init must leave the migrated database untouched.
+    db.init(db_engine)
+    with session_scope(db_engine) as session:
+        assert Query(Task, session).count() == 1
@@ -2,11 +2,14 @@
 
 """Tests for tasks3's Task ORM"""
 
+import csv
+import io
+
 import pytest
 
 from tasks3.db import Task
 
-from typing import Set
+from typing import List
 
 
 @pytest.fixture(params=["Title"])
@@ -24,12 +27,12 @@ def importance(request) -> int:
     return request.param
 
 
-@pytest.fixture(params=[{"pytest"}])
-def tags(request) -> Set[str]:
+@pytest.fixture(params=[["pytest"]])
+def tags(request) -> List[str]:
     return request.param
 
 
-def test_task_create(title: str, urgency: int, importance: int, tags: Set[str]):
+def test_task_create(title: str, urgency: int, importance: int, tags: List[str]):
     task = Task(
         title=title,
         urgency=urgency,
@@ -40,3 +43,34 @@ def test_task_create(title: str, urgency: int, importance: int, tags: Set[str]):
     assert task.urgency == urgency
     assert task.importance == importance
     assert task.tags == tags
+
+
+def test_task_priority_packing(
+    title: str, urgency: int, importance: int, tags: List[str]
+):
+    task = Task(
+        title=title,
+        urgency=urgency,
+        importance=importance,
+        tags=tags,
+    )
+    assert task.priority == (urgency << 4) | importance
+    assert task.urgency == urgency
+    assert task.importance == importance
+
+
+def test_task_priority_update(title: str, tags: List[str]):
+    task = Task(title=title, urgency=1, importance=3, tags=tags)
+    task.urgency = 4
+    assert task.urgency == 4
+    assert task.importance == 3
+    task.importance = 0
+    assert task.urgency == 4
+    assert task.importance == 0
+
+
+def test_task_csv_quoting(tags: List[str]):
+    title = 'Ship it, then "fix"\nlater'
+    task = Task(title=title, urgency=1, importance=3, tags=tags)
+    row = next(csv.reader(io.StringIO(task.csv())))
+    assert row == ["", title, "1", "3"]
@@ -276,3 +276,54 @@ def test_task_remove2(
     with db.session_scope(db_engine) as session:
         task: db.Task = session.query(db.Task).filter_by(id=id).first()
         assert task is None
+
+
+def test_task_search_id_prefix_and_partial(tmp_path: Path, db_backend: str):
+    db_engine = get_db_engine(tmp_path, db_backend)
+    task = db.Task(id="abc123", title="Title", urgency=2, importance=2, tags=[])
+    tasks3.add(task, db_engine)
+    # A plain id matches as a prefix; wrapping it in slashes matches anywhere.
+    assert [task.id for task in tasks3.search(db_engine, id="abc")] == ["abc123"]
+    assert list(tasks3.search(db_engine, id="c12")) == []
+    assert [task.id for task in tasks3.search(db_engine, id="/c12/")] == ["abc123"]
+
+
+def test_task_add_duplicate_tags(tmp_path: Path, db_backend: str):
+    db_engine = get_db_engine(tmp_path, db_backend)
+    id = tasks3.add(
+        "Title",
+        done=False,
+        urgency=2,
+        importance=2,
+        tags=["pytest", "pytest"],
+        folder=None,
+        description=None,
+        db_engine=db_engine,
+    )
+    with db.session_scope(db_engine) as session:
+        task: db.Task = session.query(db.Task).filter_by(id=id).one()
+        assert task.tags == ["pytest"]
+        assert session.query(db.Tag).count() == 1
+
+
+def test_task_add_shared_tags(tmp_path: Path, db_backend: str):
+    db_engine = get_db_engine(tmp_path, db_backend)
+    task1 = db.Task(title="First", urgency=2, importance=2, tags=["shared"])
+    task2 = db.Task(
+        title="Second", urgency=2, importance=2, tags=["shared", "extra"]
+    )
+    tasks3.add(task1, db_engine)
+    tasks3.add(task2, db_engine)
+    with db.session_scope(db_engine) as session:
+        assert session.query(db.Tag).count() == 2
+
+
+def test_task_edit_duplicate_tags(tmp_path: Path, db_backend: str):
+    db_engine = get_db_engine(tmp_path, db_backend)
+    task = db.Task(title="Title", urgency=2, importance=2, tags=["old"])
+    id = tasks3.add(task, db_engine)
+    tasks3.edit(id=id, db_engine=db_engine, tags=["new", "new", "old"])
+    with db.session_scope(db_engine) as session:
+        task = session.query(db.Task).filter_by(id=id).one()
+        assert task.tags == ["new", "old"]
+        assert session.query(db.Tag).count() == 2